@@ -0,0 +1,24 @@
+# ============================================================================
+# INDIAN FINANCE TRACKER - AHEAD-OF-TIME MF KERNELS
+# Compiles the SIP / XIRR numeric kernels into the mf_kernels extension so
+# web workers import native code instead of paying Numba JIT warm-up
+#
+# Usage: python build_kernels.py   (writes mf_kernels*.so next to this file)
+# ============================================================================
+
+import os
+
+from numba.pycc import CC
+
+import mf_kernels_src
+
+cc = CC('mf_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Export the shared definitions; the JIT path njit-compiles the same functions
+cc.export('sip_units', 'f8(f8, f8[:])')(mf_kernels_src.sip_units)
+cc.export('xirr', 'f8(f8[:], i8[:], f8)')(mf_kernels_src.xirr)
+
+
+if __name__ == "__main__":
+    cc.compile()
@@ -0,0 +1,46 @@
+# ============================================================================
+# INDIAN FINANCE TRACKER - MF KERNEL SOURCE
+# Plain-Python bodies of the SIP / XIRR kernels. python-starter-code.py
+# JIT-compiles them with numba.njit and build_kernels.py exports the same
+# functions ahead of time, so both paths always run identical code.
+# ============================================================================
+
+import numpy as np
+
+
+def sip_units(monthly_amount, navs):
+    """Units bought by investing monthly_amount at each NAV"""
+    units = 0.0
+    for i in range(navs.shape[0]):
+        units += monthly_amount / navs[i]
+    return units
+
+
+def xirr(cashflows, day_offsets, guess):
+    """
+    Newton-Raphson XIRR for dated cashflows (negative = invested)
+    
+    Returns the annual rate as a fraction, or NaN if it does not converge.
+    """
+    years = day_offsets / 365.0
+    rate = guess
+    
+    for _ in range(100):
+        npv = 0.0
+        d_npv = 0.0
+        for i in range(cashflows.shape[0]):
+            discount = (1.0 + rate) ** (-years[i])
+            npv += cashflows[i] * discount
+            d_npv -= years[i] * cashflows[i] * discount / (1.0 + rate)
+        
+        if d_npv == 0.0:
+            return np.nan
+        
+        step = npv / d_npv
+        rate -= step
+        if rate <= -1.0:
+            rate = -0.999999
+        if abs(step) < 1e-10:
+            return rate
+    
+    return np.nan
@@ -3,19 +3,281 @@
 # Quick implementation examples for bank, stock, and MF integrations
 # ============================================================================
 
+import asyncio
+import functools
+import json
+import logging
+import os
+import pickle
+import random
+import threading
+import time
 import requests
 import yfinance as yf
+import numpy as np
 import pandas as pd
+from collections import OrderedDict, defaultdict
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from requests.adapters import HTTPAdapter
+
+from mf_kernels_src import xirr as _xirr_py
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used instead
+    orjson = None
+
+try:
+    # yfinance's session is curl_cffi, whose errors do not subclass requests'
+    from curl_cffi.requests import exceptions as curl_exceptions
+except ImportError:  # older yfinance releases use plain requests
+    curl_exceptions = None
+
+try:
+    from yfinance.exceptions import YFException
+except ImportError:  # yfinance < 0.2.34 has no exception hierarchy
+    YFException = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+logger = logging.getLogger(__name__)
+
+
+def _pooled_session(headers: Optional[Dict] = None) -> requests.Session:
+    """
+    Build a requests session backed by a keep-alive connection pool
+    
+    Reusing one session per service avoids paying the TCP + TLS handshake
+    on every API call.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def _json(response: requests.Response):
+    """
+    Parse a JSON response body, using orjson when it is installed
+    
+    Raises:
+        requests.exceptions.InvalidJSONError: body is not valid JSON
+    """
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
+
+
+def _json_loads(content: bytes):
+    """Parse JSON bytes that are already known to be valid"""
+    if orjson is None:
+        return json.loads(content)
+    return orjson.loads(content)
+
+
+def _json_dumps(payload) -> bytes:
+    """Serialize a request payload to JSON bytes"""
+    if orjson is None:
+        return json.dumps(payload).encode()
+    return orjson.dumps(payload)
+
+
+# Transient network failures worth retrying; HTTP error statuses are not retried
+RETRYABLE_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+if curl_exceptions is not None:
+    RETRYABLE_ERRORS += (curl_exceptions.Timeout, curl_exceptions.ConnectionError)
+
+# Everything a yfinance call can raise for a failed or malformed upstream response
+YAHOO_ERRORS = (requests.exceptions.RequestException, json.JSONDecodeError)
+if curl_exceptions is not None:
+    YAHOO_ERRORS += (curl_exceptions.RequestException,)
+if YFException is not None:
+    YAHOO_ERRORS += (YFException,)
+
+
+def retry_transient(attempts: int = 3, initial: float = 0.2, max_wait: float = 2.0):
+    """
+    Retry a call on timeouts/connection errors with jittered exponential backoff
+    
+    The jitter spreads retries from concurrent callers so a throttled upstream
+    is not hit by a synchronized burst.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return func(*args, **kwargs)
+                except RETRYABLE_ERRORS:
+                    if attempt == attempts - 1:
+                        raise
+                    time.sleep(min(max_wait, initial * 2 ** attempt + random.uniform(0, initial)))
+        return wrapper
+    return decorator
+
+
+def _log_upstream_failure(endpoint: str, err: Exception):
+    """Log a failed upstream call with structured endpoint/error fields"""
+    logger.warning("upstream_fail endpoint=%s err=%s", endpoint, err,
+                   extra={"endpoint": endpoint, "err": str(err)})
+
+
+# Dedicated, bounded pool for fanning out blocking API calls
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fintrack-io")
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ttl seconds after being stored"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # {key: (expires_at, value)}
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if time.time() >= entry[0]:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# Freshness window (seconds) for cached GET responses, by endpoint volatility
+CACHE_POLICIES = {
+    'short': 5,     # balances, linking status
+    'normal': 30,   # statements, NAV history
+    'long': 60,     # scheme master list
+}
+
+
+class CacheMiddleware:
+    """
+    In-process response cache for idempotent GET endpoints
+    
+    Each entry keeps the raw body bytes, HTTP status and store/stale
+    timestamps. Fresh entries are served without a network call; stale ones
+    are refetched, and the last stale body is returned if the upstream call
+    fails. Bodies are parsed on every hit so callers never share (and can
+    never corrupt) the cached copy.
+    """
+    
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # {key: {body (bytes), status, stored_at, stale_at}}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict] = None) -> str:
+        return f"{method}:{url}:{sorted((params or {}).items())}"
+    
+    @staticmethod
+    @retry_transient()
+    def _fetch(session: requests.Session, url: str, params: Optional[Dict], timeout: int):
+        response = session.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.status_code, response.content, _json(response)
+    
+    def get_json(self, session: requests.Session, url: str, params: Optional[Dict] = None,
+                 policy: str = 'normal', fallback: bool = True, timeout: int = 10):
+        """
+        GET a JSON endpoint through the cache
+        
+        Timeouts and connection errors are retried with backoff before
+        falling back to the cached body.
+        
+        Raises:
+            requests.exceptions.RequestException: upstream failed and no
+            cached body was available (or fallback is disabled)
+        """
+        key = self.make_key("GET", url, params)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        
+        if entry is not None and now < entry['stale_at']:
+            return _json_loads(entry['body'])
+        
+        try:
+            status, content, body = self._fetch(session, url, params, timeout)
+        except requests.exceptions.RequestException as e:
+            if fallback and entry is not None:
+                logger.info("serving stale cache for %s after upstream failure: %s", url, e)
+                return _json_loads(entry['body'])
+            raise
+        
+        with self._lock:
+            self._entries[key] = {
+                'body': content,
+                'status': status,
+                'stored_at': now,
+                'stale_at': now + CACHE_POLICIES[policy]
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        
+        return body
 
 
 # ============================================================================
 # 1. FINBOX ACCOUNT AGGREGATOR - BANK ACCOUNT INTEGRATION
 # ============================================================================
 
+@dataclass(slots=True)
+class Transaction:
+    """
+    A single bank transaction, for callers that need per-row objects
+    
+    Field order matches the columns returned by fetch_bank_statements.
+    """
+    account_number: str
+    bank_name: str
+    date: Optional[pd.Timestamp]
+    amount: Optional[float]
+    type: str
+    description: str
+    balance: Optional[float]
+    reference_id: Optional[str]
+    
+    @classmethod
+    def from_frame(cls, transactions: pd.DataFrame) -> List['Transaction']:
+        """Materialize a statements DataFrame into Transaction objects (missing values -> None)"""
+        rows = transactions.astype(object).where(transactions.notna(), None)
+        return [cls(*row) for row in rows.itertuples(index=False, name=None)]
+
+
 class BankAggregatorService:
     """
     Integration with FinBox Account Aggregator API
@@ -30,6 +292,8 @@ class BankAggregatorService:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+        self._session = _pooled_session(self.headers)
+        self._cache = CacheMiddleware()
     
     def initiate_account_linking(self, user_id: str, redirect_url: str) -> Dict:
         """
@@ -46,31 +310,30 @@ class BankAggregatorService:
         }
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/initiate-linking",
-                json=payload,
-                headers=self.headers,
+                data=_json_dumps(payload),
                 timeout=10
             )
             response.raise_for_status()
-            return response.json()
+            return _json(response)
         except requests.exceptions.RequestException as e:
-            print(f"Error initiating account linking: {e}")
+            _log_upstream_failure("finbox/initiate-linking", e)
             return {"error": str(e)}
     
     def get_linking_status(self, user_id: str) -> Dict:
         """Check if user has completed account linking"""
         try:
-            response = requests.get(
+            return self._cache.get_json(
+                self._session,
                 f"{self.base_url}/link-status/{user_id}",
-                headers=self.headers
+                policy='short'
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
+            _log_upstream_failure("finbox/link-status", e)
             return {"error": str(e)}
     
-    def fetch_bank_statements(self, user_id: str, months: int = 6) -> List[Dict]:
+    def fetch_bank_statements(self, user_id: str, months: int = 6) -> pd.DataFrame:
         """
         Fetch linked bank statements
         
@@ -79,20 +342,19 @@ class BankAggregatorService:
             months: Number of months to fetch (max 12)
         
         Returns:
-            List of transactions with account details
+            DataFrame with one row per transaction, including account details
         """
         try:
-            response = requests.get(
+            data = self._cache.get_json(
+                self._session,
                 f"{self.base_url}/statements/{user_id}",
                 params={"months": min(months, 12)},
-                headers=self.headers
+                policy='normal'
             )
-            response.raise_for_status()
-            data = response.json()
             return self._parse_statements(data)
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching statements: {e}")
-            return []
+            _log_upstream_failure("finbox/statements", e)
+            return self._parse_statements({})
     
     def get_account_balance(self, user_id: str) -> Dict:
         """
@@ -102,122 +364,301 @@ class BankAggregatorService:
             dict: Account-wise balance details
         """
         try:
-            response = requests.get(
+            return self._cache.get_json(
+                self._session,
                 f"{self.base_url}/balance/{user_id}",
-                headers=self.headers
+                policy='short'
             )
-            response.raise_for_status()
-            return response.json()
         except requests.exceptions.RequestException as e:
+            _log_upstream_failure("finbox/balance", e)
             return {"error": str(e)}
     
-    def _parse_statements(self, raw_data: Dict) -> List[Dict]:
-        """Parse raw statement data into structured format"""
-        transactions = []
+    # ---- Async variants: run the pooled sync calls off the event loop ----
+    
+    async def initiate_account_linking_async(self, user_id: str, redirect_url: str) -> Dict:
+        """Async variant of initiate_account_linking"""
+        return await asyncio.to_thread(self.initiate_account_linking, user_id, redirect_url)
+    
+    async def get_linking_status_async(self, user_id: str) -> Dict:
+        """Async variant of get_linking_status"""
+        return await asyncio.to_thread(self.get_linking_status, user_id)
+    
+    async def fetch_bank_statements_async(self, user_id: str, months: int = 6) -> pd.DataFrame:
+        """Async variant of fetch_bank_statements"""
+        return await asyncio.to_thread(self.fetch_bank_statements, user_id, months)
+    
+    async def get_account_balance_async(self, user_id: str) -> Dict:
+        """Async variant of get_account_balance"""
+        return await asyncio.to_thread(self.get_account_balance, user_id)
+    
+    async def get_account_balances_async(self, user_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Fetch balances for several users concurrently
+        
+        Returns:
+            dict: {user_id: balance response}
+        """
+        results = await asyncio.gather(
+            *(self.get_account_balance_async(user_id) for user_id in user_ids)
+        )
+        return dict(zip(user_ids, results))
+    
+    def _parse_statements(self, raw_data: Dict) -> pd.DataFrame:
+        """Parse raw statement data into a columnar transactions frame"""
+        accounts = raw_data.get('accounts', [])
+        n = sum(len(account.get('transactions', [])) for account in accounts)
+        
+        # Fill one preallocated array per column instead of a dict per transaction
+        account_numbers = np.empty(n, dtype=object)
+        bank_names = np.empty(n, dtype=object)
+        dates = np.empty(n, dtype=object)
+        amounts = np.empty(n, dtype=np.float64)
+        descriptions = np.empty(n, dtype=object)
+        balances = np.empty(n, dtype=np.float64)
+        reference_ids = np.empty(n, dtype=object)
         
-        for account in raw_data.get('accounts', []):
-            for txn in account.get('transactions', []):
-                transactions.append({
-                    'account_number': account.get('account_number'),
-                    'bank_name': account.get('bank_name'),
-                    'date': txn.get('date'),
-                    'amount': txn.get('amount'),
-                    'type': 'debit' if txn.get('amount', 0) < 0 else 'credit',
-                    'description': txn.get('description', ''),
-                    'balance': txn.get('balance_after_transaction'),
-                    'reference_id': txn.get('reference_id')
-                })
+        start = 0
+        for account in accounts:
+            txns = account.get('transactions', [])
+            end = start + len(txns)
+            account_numbers[start:end] = account.get('account_number')
+            bank_names[start:end] = account.get('bank_name')
+            dates[start:end] = [txn.get('date') for txn in txns]
+            amounts[start:end] = [txn.get('amount') for txn in txns]
+            descriptions[start:end] = [txn.get('description', '') for txn in txns]
+            balances[start:end] = [txn.get('balance_after_transaction') for txn in txns]
+            reference_ids[start:end] = [txn.get('reference_id') for txn in txns]
+            start = end
         
-        return transactions
+        # ISO8601 accepts date-only and timestamp values in the same column
+        parsed_dates = pd.to_datetime(pd.Series(dates, dtype=object), format='ISO8601', errors='coerce')
+        unparsed = int((parsed_dates.isna() & pd.notna(dates)).sum())
+        if unparsed:
+            logger.warning("statement_dates_unparsed count=%d", unparsed)
+        
+        return pd.DataFrame({
+            'account_number': pd.Categorical(account_numbers),
+            'bank_name': pd.Categorical(bank_names),
+            'date': parsed_dates.to_numpy(),
+            'amount': amounts,
+            # Sign bit indexes the categories directly: int8 codes, no per-row strings
+            'type': pd.Categorical.from_codes((amounts < 0).view(np.int8),
+                                              categories=['credit', 'debit']),
+            'description': descriptions,
+            'balance': balances,
+            'reference_id': reference_ids
+        })
 
 
 # ============================================================================
 # 2. STOCK PORTFOLIO SERVICE - YFINANCE & NSEPY
 # ============================================================================
 
+@njit(cache=True)
+def _sma_pair_nb(values, short_window, long_window):
+    """
+    Simple moving averages for two window sizes in one pass over values
+    
+    Matches pandas rolling(window).mean(): NaN until the window fills and
+    for any window containing a NaN.
+    """
+    n = values.shape[0]
+    short_sma = np.full(n, np.nan)
+    long_sma = np.full(n, np.nan)
+    short_sum = 0.0
+    long_sum = 0.0
+    short_nans = 0
+    long_nans = 0
+    
+    for i in range(n):
+        if np.isnan(values[i]):
+            short_nans += 1
+            long_nans += 1
+        else:
+            short_sum += values[i]
+            long_sum += values[i]
+        
+        if i >= short_window:
+            if np.isnan(values[i - short_window]):
+                short_nans -= 1
+            else:
+                short_sum -= values[i - short_window]
+        if i >= long_window:
+            if np.isnan(values[i - long_window]):
+                long_nans -= 1
+            else:
+                long_sum -= values[i - long_window]
+        
+        if i >= short_window - 1 and short_nans == 0:
+            short_sma[i] = short_sum / short_window
+        if i >= long_window - 1 and long_nans == 0:
+            long_sma[i] = long_sum / long_window
+    
+    return short_sma, long_sma
+
+
+@njit(cache=True)
+def _gain_metrics_nb(invested, quantity, price):
+    """
+    Current value, gain/loss and gain/loss % for each holding
+    
+    Serial on purpose: stock and MF metrics run concurrently on EXECUTOR,
+    and Numba's fallback workqueue threading layer aborts when parallel
+    kernels are entered from several threads. Without Numba the same array
+    expressions run as vectorized NumPy.
+    """
+    current = quantity * price
+    gain_loss = current - invested
+    safe_invested = np.where(invested > 0, invested, 1.0)
+    gain_loss_percent = np.where(invested > 0, gain_loss / safe_invested * 100, 0.0)
+    return current, gain_loss, gain_loss_percent
+
+
+# Batched Yahoo quote endpoint; accepts up to ~100 symbols per request.
+# Called through yfinance's session, which supplies the cookie/crumb and
+# browser impersonation Yahoo requires.
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+YAHOO_QUOTE_BATCH = 100
+
+
 class StockPortfolioService:
     """
     Manage stock holdings using yfinance for prices and NSEpy for Indian stocks
     """
     
     def __init__(self):
-        self.holdings = {}  # {ticker: {'qty': int, 'cost': float, 'date': str}}
+        # One row per ticker; metrics are computed as column operations
+        self.holdings = pd.DataFrame(
+            columns=['quantity', 'purchase_price', 'purchase_date', 'current_price']
+        ).astype({'quantity': 'float64', 'purchase_price': 'float64', 'current_price': 'float64'})
+        self.holdings.index.name = 'ticker'
+        self._analysis_cache = TTLCache(maxsize=1024, ttl=300)  # {(user_id, ticker, period): (info, hist)}
+        self._price_cache = TTLCache(maxsize=4096, ttl=CACHE_POLICIES['long'])  # {ticker: (quote, fetched_at)}
     
     def add_stock(self, ticker: str, quantity: float, purchase_price: float, 
                   purchase_date: str):
         """Add stock holding"""
-        self.holdings[ticker] = {
-            'quantity': quantity,
-            'purchase_price': purchase_price,
-            'purchase_date': purchase_date,
-            'current_price': None
-        }
+        self.holdings.loc[ticker] = [float(quantity), float(purchase_price), purchase_date, np.nan]
     
-    def fetch_current_prices(self, tickers: List[str]) -> Dict:
+    def fetch_current_prices(self, tickers: List[str],
+                             max_age: float = CACHE_POLICIES['long']) -> Dict:
         """
         Fetch current prices for multiple tickers
         
         Indian stocks use .NS (NSE) and .BO (BSE) suffixes
         Example: 'RELIANCE.NS', 'TCS.NS', 'INFY.NS'
+        
+        Args:
+            tickers: Symbols to quote; duplicates are fetched once
+            max_age: Reuse quotes fetched within this many seconds (at most
+                60); use CACHE_POLICIES['short'] for live dashboards
         """
         prices = {}
+        stale = []
+        now = time.time()
         
-        try:
-            data = yf.download(tickers, period='1d', progress=False, group_by='ticker')
-            
-            for ticker in tickers:
-                try:
-                    stock = yf.Ticker(ticker)
-                    current_price = stock.info.get('currentPrice')
-                    prices[ticker] = {
-                        'price': current_price,
-                        'market_cap': stock.info.get('marketCap'),
-                        'pe_ratio': stock.info.get('trailingPE'),
-                        'change_percent': stock.info.get('regularMarketChangePercent'),
-                        '52_week_high': stock.info.get('fiftyTwoWeekHigh'),
-                        '52_week_low': stock.info.get('fiftyTwoWeekLow'),
-                    }
-                except Exception as e:
-                    print(f"Error fetching {ticker}: {e}")
+        for ticker in dict.fromkeys(tickers):
+            cached = self._price_cache.get(ticker)
+            if cached is not None and now - cached[1] <= max_age:
+                prices[ticker] = cached[0]
+            else:
+                stale.append(ticker)
         
-        except Exception as e:
-            print(f"Error downloading data: {e}")
+        # One quote request per batch instead of one quoteSummary call per ticker
+        for start in range(0, len(stale), YAHOO_QUOTE_BATCH):
+            batch = stale[start:start + YAHOO_QUOTE_BATCH]
+            try:
+                quotes = self._fetch_quote_batch(batch)
+            except YAHOO_ERRORS as e:
+                _log_upstream_failure("yahoo/quote", e)
+                continue
+            
+            # Yahoo echoes canonical symbols; key results by the ticker asked for
+            requested = {ticker.upper(): ticker for ticker in batch}
+            for quote in quotes:
+                ticker = requested.get(str(quote.get('symbol', '')).upper())
+                if ticker is None:
+                    continue
+                prices[ticker] = {
+                    'price': quote.get('regularMarketPrice'),
+                    'market_cap': quote.get('marketCap'),
+                    'pe_ratio': quote.get('trailingPE'),
+                    'change_percent': quote.get('regularMarketChangePercent'),
+                    '52_week_high': quote.get('fiftyTwoWeekHigh'),
+                    '52_week_low': quote.get('fiftyTwoWeekLow'),
+                }
+                self._price_cache.set(ticker, (prices[ticker], now))
         
         return prices
     
+    @retry_transient()
+    def _fetch_quote_batch(self, batch: List[str]) -> List[Dict]:
+        """Fetch raw Yahoo quotes for up to YAHOO_QUOTE_BATCH symbols"""
+        try:
+            # Private yfinance API: it has no stability guarantee across releases
+            from yfinance.data import YfData
+        except ImportError:
+            return self._fetch_quote_batch_public(batch)
+        
+        data = YfData().get_raw_json(
+            YAHOO_QUOTE_URL,
+            params={"symbols": ",".join(batch), "formatted": "false"},
+            timeout=10
+        )
+        return data.get('quoteResponse', {}).get('result') or []
+    
+    @staticmethod
+    def _fetch_quote_batch_public(batch: List[str]) -> List[Dict]:
+        """
+        Build v7-style quotes through the public yf.Tickers API
+        
+        Slower than the batched quote endpoint (one lookup per symbol), used
+        only when yfinance no longer exposes YfData.
+        """
+        quotes = []
+        for symbol, stock in yf.Tickers(" ".join(batch)).tickers.items():
+            info = stock.fast_info
+            price = info.last_price
+            previous = info.previous_close
+            quotes.append({
+                'symbol': symbol,
+                'regularMarketPrice': price,
+                'marketCap': info.market_cap,
+                'trailingPE': None,
+                'regularMarketChangePercent': (price / previous - 1) * 100 if price and previous else None,
+                'fiftyTwoWeekHigh': info.year_high,
+                'fiftyTwoWeekLow': info.year_low,
+            })
+        return quotes
+    
     def calculate_portfolio_metrics(self) -> Dict:
         """Calculate portfolio gains, losses, and allocations"""
-        tickers = list(self.holdings.keys())
+        tickers = self.holdings.index.tolist()
         if not tickers:
             return {}
         
         prices = self.fetch_current_prices(tickers)
         
-        total_invested = 0
-        total_current = 0
-        holdings_detail = {}
+        quoted = pd.Series({ticker: prices.get(ticker, {}).get('price') for ticker in tickers},
+                           dtype=np.float64)
+        self.holdings['current_price'] = quoted.fillna(self.holdings['purchase_price'])
         
-        for ticker, holding in self.holdings.items():
-            invested_value = holding['purchase_price'] * holding['quantity']
-            current_price = prices.get(ticker, {}).get('price', holding['purchase_price'])
-            current_value = current_price * holding['quantity']
-            
-            gain_loss = current_value - invested_value
-            gain_loss_percent = (gain_loss / invested_value * 100) if invested_value > 0 else 0
-            
-            total_invested += invested_value
-            total_current += current_value
-            
-            holdings_detail[ticker] = {
-                'quantity': holding['quantity'],
-                'purchase_price': holding['purchase_price'],
-                'current_price': current_price,
-                'invested_value': invested_value,
-                'current_value': current_value,
-                'gain_loss': gain_loss,
-                'gain_loss_percent': gain_loss_percent,
-                'allocation_percent': (current_value / total_current * 100) if total_current > 0 else 0
-            }
+        df = self.holdings.copy()
+        df['invested_value'] = df['purchase_price'] * df['quantity']
+        df['current_value'], df['gain_loss'], df['gain_loss_percent'] = _gain_metrics_nb(
+            df['invested_value'].to_numpy(dtype=np.float64),
+            df['quantity'].to_numpy(dtype=np.float64),
+            df['current_price'].to_numpy(dtype=np.float64)
+        )
+        
+        total_invested = float(df['invested_value'].sum())
+        total_current = float(df['current_value'].sum())
+        df['allocation_percent'] = (df['current_value'] / total_current * 100) if total_current > 0 else 0
+        
+        holdings_detail = df[[
+            'quantity', 'purchase_price', 'current_price', 'invested_value',
+            'current_value', 'gain_loss', 'gain_loss_percent', 'allocation_percent'
+        ]].to_dict(orient='index')
         
         return {
             'total_invested': total_invested,
@@ -227,37 +668,53 @@ class StockPortfolioService:
             'holdings': holdings_detail
         }
     
-    def get_stock_analysis(self, ticker: str, period: str = '1y') -> Dict:
-        """Get detailed stock analysis with technical data"""
+    def get_stock_analysis(self, ticker: str, period: str = '1y',
+                           user_id: Optional[str] = None) -> Dict:
+        """
+        Get detailed stock analysis with technical data
+        
+        Results are cached for 5 minutes per (user_id, ticker, period).
+        """
+        key = (user_id, ticker, period)
+        cached = self._analysis_cache.get(key)
+        
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period=period)
-            
-            # Calculate simple moving averages
-            hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
-            hist['SMA_50'] = hist['Close'].rolling(window=50).mean()
+            if cached is None:
+                stock = yf.Ticker(ticker)
+                hist = stock.history(period=period)
+                
+                # Calculate simple moving averages
+                closes = hist['Close'].to_numpy(dtype=np.float64)
+                hist['SMA_20'], hist['SMA_50'] = _sma_pair_nb(closes, 20, 50)
+                
+                cached = (stock.info, hist)
+                self._analysis_cache.set(key, cached)
             
+            info, hist = cached
             return {
                 'ticker': ticker,
-                'name': stock.info.get('longName'),
-                'sector': stock.info.get('sector'),
-                'industry': stock.info.get('industry'),
-                'current_price': stock.info.get('currentPrice'),
-                'previous_close': stock.info.get('previousClose'),
-                'open_price': stock.info.get('open'),
-                'day_high': stock.info.get('dayHigh'),
-                'day_low': stock.info.get('dayLow'),
-                '52_week_high': stock.info.get('fiftyTwoWeekHigh'),
-                '52_week_low': stock.info.get('fiftyTwoWeekLow'),
-                'market_cap': stock.info.get('marketCap'),
-                'volume': stock.info.get('volume'),
-                'pe_ratio': stock.info.get('trailingPE'),
-                'dividend_yield': stock.info.get('dividendYield'),
-                'earnings_growth': stock.info.get('earningsGrowth'),
-                'historical_data': hist.to_dict()
+                'name': info.get('longName'),
+                'sector': info.get('sector'),
+                'industry': info.get('industry'),
+                'current_price': info.get('currentPrice'),
+                'previous_close': info.get('previousClose'),
+                'open_price': info.get('open'),
+                'day_high': info.get('dayHigh'),
+                'day_low': info.get('dayLow'),
+                '52_week_high': info.get('fiftyTwoWeekHigh'),
+                '52_week_low': info.get('fiftyTwoWeekLow'),
+                'market_cap': info.get('marketCap'),
+                'volume': info.get('volume'),
+                'pe_ratio': info.get('trailingPE'),
+                'dividend_yield': info.get('dividendYield'),
+                'earnings_growth': info.get('earningsGrowth'),
+                # Columnar OHLCV (one list per column) keyed alongside epoch-ms dates
+                'dates': hist.index.as_unit('ms').asi8.tolist(),
+                'historical_data': {column: hist[column].tolist() for column in hist.columns}
             }
         except Exception as e:
-            print(f"Error analyzing {ticker}: {e}")
+            logger.warning("stock_analysis_fail ticker=%s err=%s", ticker, e,
+                           extra={"ticker": ticker, "err": str(e)})
             return {}
 
 
@@ -265,6 +722,23 @@ class StockPortfolioService:
 # 3. MUTUAL FUND SERVICE - MFAPI.IN INTEGRATION
 # ============================================================================
 
+# Newton-Raphson XIRR; the body lives in mf_kernels_src so the AOT build shares it
+_xirr_nb = njit(cache=True, fastmath=True)(_xirr_py)
+
+
+try:
+    # Ahead-of-time build from build_kernels.py: no JIT warm-up in fresh workers
+    from mf_kernels import sip_units as _sip_units_aot, xirr as _xirr_kernel
+except ImportError:
+    _sip_units_aot = None
+    _xirr_kernel = _xirr_nb
+
+
+# On-disk scheme search index, rebuilt from mfapi.in at most once a day
+MF_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "fintrack", "mf_index.pkl")
+MF_INDEX_MAX_AGE = 24 * 60 * 60
+
+
 class MutualFundService:
     """
     Manage mutual fund holdings using mfapi.in (free Indian MF data API)
@@ -272,52 +746,190 @@ class MutualFundService:
     
     def __init__(self):
         self.mf_api_url = "https://api.mfapi.in/mf"
-        self.holdings = {}  # {scheme_code: {units, nav, amount_invested}}
+        # One row per scheme_code; metrics are computed as column operations
+        self.holdings = pd.DataFrame(
+            columns=['units', 'amount_invested', 'current_nav', 'purchase_date']
+        ).astype({'units': 'float64', 'amount_invested': 'float64', 'current_nav': 'float64'})
+        self.holdings.index.name = 'scheme_code'
+        self._session = _pooled_session()
+        self._cache = CacheMiddleware()
+        self._index = None  # {'built_at', 'names': {code: name}, 'position': {code: i}, 'tokens': {token: [codes]}}
+        self._nav_cache = TTLCache(maxsize=1024, ttl=CACHE_POLICIES['normal'])  # {code: (dates, navs)}
     
     def get_all_schemes(self) -> List[Dict]:
         """Fetch all available mutual fund schemes"""
         try:
-            response = requests.get(f"{self.mf_api_url}/")
-            response.raise_for_status()
-            return response.json()
+            return self._cache.get_json(self._session, f"{self.mf_api_url}/", policy='long')
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching schemes: {e}")
+            _log_upstream_failure("mfapi/schemes", e)
             return []
     
+    @staticmethod
+    def _build_scheme_index(schemes: List[Dict]) -> Dict:
+        """Build a lowercase word -> scheme codes inverted index"""
+        names = {}
+        tokens = defaultdict(list)
+        
+        for scheme in schemes:
+            scheme_code = str(scheme.get('schemeCode'))
+            scheme_name = scheme.get('schemeName', '')
+            names[scheme_code] = scheme_name
+            for token in set(scheme_name.lower().split()):
+                tokens[token].append(scheme_code)
+        
+        position = {scheme_code: i for i, scheme_code in enumerate(names)}
+        return {'built_at': time.time(), 'names': names, 'position': position, 'tokens': dict(tokens)}
+    
+    def _load_scheme_index(self) -> Dict:
+        """Return the scheme index, loading it from disk or rebuilding it when stale"""
+        if self._index is not None and time.time() - self._index['built_at'] < MF_INDEX_MAX_AGE:
+            return self._index
+        
+        try:
+            if time.time() - os.path.getmtime(MF_INDEX_PATH) < MF_INDEX_MAX_AGE:
+                with open(MF_INDEX_PATH, 'rb') as f:
+                    index = pickle.load(f)
+                if 'position' in index:  # older index files are rebuilt
+                    self._index = index
+                    return index
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        
+        index = self._build_scheme_index(self.get_all_schemes())
+        if not index['names']:
+            # Scheme list fetch failed; retry on the next search
+            return index
+        
+        try:
+            os.makedirs(os.path.dirname(MF_INDEX_PATH), exist_ok=True)
+            tmp_path = f"{MF_INDEX_PATH}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, MF_INDEX_PATH)
+        except OSError as e:
+            logger.warning("scheme_index_save_fail path=%s err=%s", MF_INDEX_PATH, e)
+        
+        self._index = index
+        return index
+    
     def search_scheme(self, scheme_name: str) -> Optional[Dict]:
-        """Search for a specific scheme"""
-        schemes = self.get_all_schemes()
-        
-        for scheme_code, scheme_data in schemes.items():
-            if scheme_name.lower() in scheme_data.get('schemeName', '').lower():
-                return {
-                    'scheme_code': scheme_code,
-                    'scheme_name': scheme_data.get('schemeName')
-                }
-        return None
+        """
+        Search for a specific scheme
+        
+        Returns the first scheme, in mfapi list order, whose name contains
+        scheme_name (case-insensitive).
+        """
+        query = scheme_name.lower()
+        index = self._load_scheme_index()
+        names = index['names']
+        
+        # Whole-word queries find a match through the token buckets; only
+        # schemes listed before it then need scanning for partial-word hits
+        match = None
+        buckets = [index['tokens'].get(token) for token in query.split()]
+        if buckets and all(buckets):
+            buckets.sort(key=len)
+            others = [set(bucket) for bucket in buckets[1:]]
+            match = next((code for code in buckets[0]
+                          if all(code in other for other in others)
+                          and query in names[code].lower()), None)
+        
+        limit = index['position'][match] if match is not None else len(names)
+        for scheme_code in islice(names, limit):
+            if query in names[scheme_code].lower():
+                match = scheme_code
+                break
+        
+        if match is None:
+            return None
+        return {
+            'scheme_code': match,
+            'scheme_name': names[match]
+        }
     
-    def get_scheme_nav_history(self, scheme_code: str) -> List[Dict]:
-        """Fetch NAV history for a scheme"""
+    def get_scheme_nav_history(self, scheme_code: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetch NAV history for a scheme, newest first
+        
+        Returns:
+            (dates, navs): datetime64[D] and float64 arrays, parsed once and
+            cached so downstream calculations reuse the same buffers
+        """
+        cached = self._nav_cache.get(scheme_code)
+        if cached is not None:
+            return cached
+        
         try:
-            response = requests.get(f"{self.mf_api_url}/{scheme_code}")
-            response.raise_for_status()
-            data = response.json()
-            return data.get('data', {}).get('nav', [])
+            data = self._cache.get_json(self._session, f"{self.mf_api_url}/{scheme_code}",
+                                        policy='normal')
         except requests.exceptions.RequestException as e:
-            print(f"Error fetching NAV: {e}")
-            return []
+            _log_upstream_failure(f"mfapi/{scheme_code}", e)
+            return np.array([], dtype='datetime64[D]'), np.array([], dtype=np.float64)
+        
+        rows = data.get('data') if isinstance(data, dict) else None
+        rows = [row for row in rows or [] if isinstance(row, dict)]
+        
+        # Coerce malformed rows to NaN/NaT and drop them rather than raising
+        navs = pd.to_numeric(pd.Series([row.get('nav') for row in rows], dtype=object),
+                             errors='coerce').to_numpy(dtype=np.float64)
+        dates = pd.to_datetime(pd.Series([row.get('date') for row in rows], dtype=object),
+                               format='%d-%m-%Y', errors='coerce').to_numpy(dtype='datetime64[D]')
+        valid = (navs > 0) & ~np.isnat(dates)
+        if not valid.all():
+            logger.warning("nav_rows_dropped scheme=%s count=%d", scheme_code, int((~valid).sum()))
+            dates, navs = dates[valid], navs[valid]
+        
+        self._nav_cache.set(scheme_code, (dates, navs))
+        return dates, navs
     
     def add_holding(self, scheme_code: str, units: float, amount_invested: float):
         """Add mutual fund holding"""
-        nav_history = self.get_scheme_nav_history(scheme_code)
-        latest_nav = float(nav_history[0]['nav']) if nav_history else 0
+        _, navs = self.get_scheme_nav_history(scheme_code)
+        self._store_holding(scheme_code, units, amount_invested, navs)
+    
+    def add_holdings_bulk(self, items: List[Tuple[str, float, float]]):
+        """
+        Add several holdings, fetching their NAV histories concurrently
         
-        self.holdings[scheme_code] = {
-            'units': units,
-            'amount_invested': amount_invested,
-            'current_nav': latest_nav,
-            'purchase_date': datetime.now().isoformat()
-        }
+        A scheme whose NAV fetch fails is stored with a NAV of 0, as
+        add_holding does, so one bad scheme never drops the rest.
+        
+        Args:
+            items: (scheme_code, units, amount_invested) tuples
+        """
+        futures = [EXECUTOR.submit(self.get_scheme_nav_history, scheme_code)
+                   for scheme_code, _, _ in items]
+        
+        rows = {}
+        for (scheme_code, units, amount_invested), future in zip(items, futures):
+            try:
+                _, navs = future.result()
+            except Exception as e:
+                _log_upstream_failure(f"mfapi/{scheme_code}", e)
+                navs = np.array([], dtype=np.float64)
+            rows[scheme_code] = self._holding_row(units, amount_invested, navs)
+        
+        if not rows:
+            return
+        
+        # One concat for the whole batch; per-row .loc appends copy the frame each time
+        new = pd.DataFrame.from_dict(rows, orient='index', columns=self.holdings.columns)
+        new = new.astype(self.holdings.dtypes.to_dict())
+        new.index.name = self.holdings.index.name
+        self.holdings = new if self.holdings.empty else pd.concat(
+            [self.holdings.drop(index=new.index, errors='ignore'), new]
+        )
+    
+    @staticmethod
+    def _holding_row(units: float, amount_invested: float, navs: np.ndarray) -> List:
+        """Build a holdings row valued at the latest NAV in navs"""
+        latest_nav = float(navs[0]) if len(navs) else 0.0
+        return [float(units), float(amount_invested), latest_nav, datetime.now().isoformat()]
+    
+    def _store_holding(self, scheme_code: str, units: float, amount_invested: float,
+                       navs: np.ndarray):
+        """Record a holding valued at the latest NAV in navs"""
+        self.holdings.loc[scheme_code] = self._holding_row(units, amount_invested, navs)
     
     def calculate_portfolio_metrics(self) -> Dict:
         """Calculate MF portfolio gains and performance"""
@@ -325,22 +937,20 @@ class MutualFundService:
         total_current = 0
         holdings_detail = {}
         
-        for scheme_code, holding in self.holdings.items():
-            current_value = holding['units'] * holding['current_nav']
-            gain_loss = current_value - holding['amount_invested']
-            gain_loss_percent = (gain_loss / holding['amount_invested'] * 100) if holding['amount_invested'] > 0 else 0
-            
-            total_invested += holding['amount_invested']
-            total_current += current_value
+        if not self.holdings.empty:
+            df = self.holdings.copy()
+            df['nav'] = df['current_nav']
+            df['current_value'], df['gain_loss'], df['gain_loss_percent'] = _gain_metrics_nb(
+                df['amount_invested'].to_numpy(dtype=np.float64),
+                df['units'].to_numpy(dtype=np.float64),
+                df['current_nav'].to_numpy(dtype=np.float64)
+            )
             
-            holdings_detail[scheme_code] = {
-                'units': holding['units'],
-                'nav': holding['current_nav'],
-                'amount_invested': holding['amount_invested'],
-                'current_value': current_value,
-                'gain_loss': gain_loss,
-                'gain_loss_percent': gain_loss_percent
-            }
+            total_invested = float(df['amount_invested'].sum())
+            total_current = float(df['current_value'].sum())
+            holdings_detail = df[[
+                'units', 'nav', 'amount_invested', 'current_value', 'gain_loss', 'gain_loss_percent'
+            ]].to_dict(orient='index')
         
         return {
             'total_invested': total_invested,
@@ -352,20 +962,17 @@ class MutualFundService:
     
     def calculate_sip_returns(self, scheme_code: str, monthly_amount: float, months: int) -> Dict:
         """Calculate SIP (Systematic Investment Plan) returns"""
-        nav_history = self.get_scheme_nav_history(scheme_code)
+        _, navs = self.get_scheme_nav_history(scheme_code)
         
-        if len(nav_history) < months:
-            return {"error": f"Insufficient data. Only {len(nav_history)} months available"}
+        if len(navs) < months:
+            return {"error": f"Insufficient data. Only {len(navs)} months available"}
         
         total_invested = monthly_amount * months
-        units_purchased = 0
         
         # Simulate monthly investments
-        for i in range(min(months, len(nav_history))):
-            nav = float(nav_history[i]['nav'])
-            units_purchased += monthly_amount / nav
+        units_purchased = float(self._sip_units(monthly_amount, navs[:months]))
         
-        latest_nav = float(nav_history[0]['nav'])
+        latest_nav = float(navs[0])
         current_value = units_purchased * latest_nav
         gain = current_value - total_invested
         gain_percent = (gain / total_invested * 100) if total_invested > 0 else 0
@@ -381,12 +988,39 @@ class MutualFundService:
             'xirr_estimate': self._estimate_xirr(current_value, total_invested, months)
         }
     
+    @staticmethod
+    def _sip_units(monthly_amount: float, navs: np.ndarray):
+        """
+        Units bought by investing monthly_amount at each NAV
+        
+        navs may be 1-D (one scheme) or 2-D (schemes x months), in which case
+        units are returned per scheme.
+        """
+        if _sip_units_aot is not None and navs.ndim == 1:
+            return _sip_units_aot(monthly_amount, np.ascontiguousarray(navs))
+        return (monthly_amount / navs).sum(axis=-1)
+    
     @staticmethod
     def _estimate_xirr(current_value: float, total_invested: float, months: int) -> float:
-        """Rough XIRR estimate (simplified calculation)"""
+        """
+        XIRR (annual %) for equal monthly investments valued at the last one
+        
+        Falls back to a simple annualized return when the solver cannot
+        converge, e.g. for a single instalment.
+        """
         if total_invested == 0 or months == 0:
             return 0
         
+        monthly_amount = total_invested / months
+        day_offsets = np.round(np.arange(months + 1) * 365.25 / 12).astype(np.int64)
+        day_offsets[-1] = day_offsets[-2]
+        cashflows = np.full(months + 1, -monthly_amount, dtype=np.float64)
+        cashflows[-1] = current_value
+        
+        rate = _xirr_kernel(cashflows, day_offsets, 0.1)
+        if not np.isnan(rate):
+            return float(rate * 100)
+        
         total_return = (current_value - total_invested) / total_invested
         annual_return = ((1 + total_return) ** (12 / months) - 1) * 100
         return annual_return
@@ -406,20 +1040,14 @@ class FinanceTrackerDashboard:
         self.stock_service = StockPortfolioService()
         self.mf_service = MutualFundService()
     
-    def get_net_worth(self) -> Dict:
-        """Calculate total net worth across all assets"""
-        
-        # Get bank balance
-        bank_balance = 0  # Would fetch from bank_service in real implementation
-        
-        # Get stock portfolio value
-        stock_metrics = self.stock_service.calculate_portfolio_metrics()
-        stock_value = stock_metrics.get('total_current', 0)
-        
-        # Get MF portfolio value
-        mf_metrics = self.mf_service.calculate_portfolio_metrics()
-        mf_value = mf_metrics.get('total_current', 0)
-        
+    @staticmethod
+    def _total_bank_balance(balance: Dict) -> float:
+        """Sum balances across all linked accounts in a balance response"""
+        return sum(account.get('balance') or 0 for account in balance.get('accounts', []))
+    
+    @staticmethod
+    def _summarize_net_worth(bank_balance: float, stock_value: float, mf_value: float) -> Dict:
+        """Build the net worth summary with asset allocation"""
         total_net_worth = bank_balance + stock_value + mf_value
         
         return {
@@ -434,10 +1062,60 @@ class FinanceTrackerDashboard:
             }
         }
     
+    def get_net_worth(self, user_id: Optional[str] = None) -> Dict:
+        """
+        Calculate total net worth across all assets
+        
+        Bank, stock and MF data are fetched concurrently on EXECUTOR.
+        
+        Args:
+            user_id: Linked bank user; bank balance is 0 when not provided
+        """
+        f_stock = EXECUTOR.submit(self.stock_service.calculate_portfolio_metrics)
+        f_mf = EXECUTOR.submit(self.mf_service.calculate_portfolio_metrics)
+        f_bank = EXECUTOR.submit(self.bank_service.get_account_balance, user_id) if user_id else None
+        
+        # Get bank balance
+        bank_balance = self._total_bank_balance(f_bank.result()) if f_bank else 0
+        
+        # Get stock portfolio value
+        stock_metrics = f_stock.result()
+        stock_value = stock_metrics.get('total_current', 0)
+        
+        # Get MF portfolio value
+        mf_metrics = f_mf.result()
+        mf_value = mf_metrics.get('total_current', 0)
+        
+        return self._summarize_net_worth(bank_balance, stock_value, mf_value)
+    
+    async def get_net_worth_async(self, user_id: Optional[str] = None) -> Dict:
+        """
+        Calculate total net worth, fetching bank, stock and MF data concurrently
+        
+        Args:
+            user_id: Linked bank user; bank balance is 0 when not provided
+        """
+        async def no_balance() -> Dict:
+            return {}
+        
+        bank_task = (self.bank_service.get_account_balance_async(user_id)
+                     if user_id else no_balance())
+        stock_task = asyncio.to_thread(self.stock_service.calculate_portfolio_metrics)
+        mf_task = asyncio.to_thread(self.mf_service.calculate_portfolio_metrics)
+        
+        balance, stock_metrics, mf_metrics = await asyncio.gather(bank_task, stock_task, mf_task)
+        
+        return self._summarize_net_worth(
+            self._total_bank_balance(balance),
+            stock_metrics.get('total_current', 0),
+            mf_metrics.get('total_current', 0)
+        )
+    
     def get_portfolio_performance(self) -> Dict:
         """Get combined portfolio performance"""
-        stock_metrics = self.stock_service.calculate_portfolio_metrics()
-        mf_metrics = self.mf_service.calculate_portfolio_metrics()
+        f_stock = EXECUTOR.submit(self.stock_service.calculate_portfolio_metrics)
+        f_mf = EXECUTOR.submit(self.mf_service.calculate_portfolio_metrics)
+        stock_metrics, mf_metrics = f_stock.result(), f_mf.result()
         
         total_invested = stock_metrics.get('total_invested', 0) + mf_metrics.get('total_invested', 0)
         total_current = stock_metrics.get('total_current', 0) + mf_metrics.get('total_current', 0)
@@ -0,0 +1,19 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# Match running the script directly: its sibling modules are importable
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def ft():
+    """The tracker module; its file name is not importable with a plain import"""
+    spec = importlib.util.spec_from_file_location("fintrack", ROOT / "python-starter-code.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # numba's on-disk cache re-imports the module by name
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,27 @@
+import requests
+
+
+class FakeSession:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        return response
+
+
+def test_cache_hits_do_not_share_mutable_body(ft):
+    cache = ft.CacheMiddleware()
+    session = FakeSession(b'{"data": [1, 2]}')
+
+    first = cache.get_json(session, "https://example.test/nav")
+    first["data"].append(3)
+    second = cache.get_json(session, "https://example.test/nav")
+    second["data"].clear()
+
+    assert session.calls == 1
+    assert cache.get_json(session, "https://example.test/nav") == {"data": [1, 2]}
@@ -0,0 +1,56 @@
+import importlib.util
+
+import numpy as np
+import pandas as pd
+import pytest
+
+CASHFLOWS = np.array([-5000.0, -5000.0, -5000.0, -5000.0, 21500.0])
+DAY_OFFSETS = np.array([0, 31, 59, 90, 120], dtype=np.int64)
+NAVS = np.array([41.2, 43.7, 39.9, 45.1])
+
+
+def test_aot_kernels_match_jit(ft, tmp_path):
+    pytest.importorskip("numba.pycc")
+    import build_kernels
+
+    build_kernels.cc.output_dir = str(tmp_path)
+    build_kernels.cc.compile()
+    built = next(tmp_path.glob("mf_kernels*"))
+    spec = importlib.util.spec_from_file_location("mf_kernels", built)
+    aot = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(aot)
+
+    assert aot.xirr(CASHFLOWS, DAY_OFFSETS, 0.1) == pytest.approx(ft._xirr_nb(CASHFLOWS, DAY_OFFSETS, 0.1), rel=1e-9)
+    assert aot.sip_units(5000.0, NAVS) == pytest.approx(ft.MutualFundService._sip_units(5000.0, NAVS), rel=1e-12)
+
+
+def test_xirr_known_annual_rate(ft):
+    rate = ft._xirr_nb(np.array([-1.0, 1.1]), np.array([0, 365], dtype=np.int64), 0.1)
+
+    assert rate == pytest.approx(0.10, abs=1e-9)
+
+
+def test_xirr_returns_nan_without_a_sign_change(ft):
+    rate = ft._xirr_nb(np.array([-1.0, -1.0]), np.array([0, 365], dtype=np.int64), 0.1)
+
+    assert np.isnan(rate)
+
+
+def test_estimate_xirr_single_instalment_uses_annualized_return(ft):
+    # One instalment valued the same day gives the solver zero elapsed time
+    assert ft.MutualFundService._estimate_xirr(1100.0, 1000.0, 1) == pytest.approx((1.1 ** 12 - 1) * 100)
+
+
+def test_estimate_xirr_monthly_sip(ft):
+    xirr = ft.MutualFundService._estimate_xirr(130000.0, 120000.0, 12)
+
+    assert 10 < xirr < 20
+
+
+def test_sma_pair_matches_pandas_rolling_with_nans(ft):
+    values = np.array([1.0, 2.0, np.nan, 4.0, 5.0, 6.0, 7.0, np.nan, 9.0, 10.0, 11.0, 12.0, 13.0])
+
+    short_sma, long_sma = ft._sma_pair_nb(values, 2, 4)
+
+    np.testing.assert_allclose(short_sma, pd.Series(values).rolling(2).mean().to_numpy(), equal_nan=True)
+    np.testing.assert_allclose(long_sma, pd.Series(values).rolling(4).mean().to_numpy(), equal_nan=True)
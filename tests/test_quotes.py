@@ -0,0 +1,18 @@
+import sys
+from types import SimpleNamespace
+
+
+def test_quotes_fall_back_to_public_tickers_without_yfdata(ft, monkeypatch):
+    class FakeTickers:
+        def __init__(self, symbols):
+            self.tickers = {symbol: SimpleNamespace(fast_info=SimpleNamespace(
+                last_price=110.0, previous_close=100.0, market_cap=1e9,
+                year_high=120.0, year_low=80.0,
+            )) for symbol in symbols.split()}
+
+    monkeypatch.setitem(sys.modules, "yfinance.data", None)  # import now raises ImportError
+    monkeypatch.setattr(ft.yf, "Tickers", FakeTickers)
+    prices = ft.StockPortfolioService().fetch_current_prices(["TCS.NS"])
+
+    assert prices["TCS.NS"]["price"] == 110.0
+    assert round(prices["TCS.NS"]["change_percent"], 6) == 10.0
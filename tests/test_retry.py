@@ -0,0 +1,53 @@
+import pytest
+import requests
+
+curl_exceptions = pytest.importorskip("curl_cffi.requests.exceptions")
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(ft, monkeypatch):
+    monkeypatch.setattr(ft.time, "sleep", lambda seconds: None)
+
+
+def test_retry_transient_retries_curl_cffi_timeout(ft):
+    calls = []
+
+    @ft.retry_transient(attempts=3)
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise curl_exceptions.Timeout("timed out")
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(calls) == 3
+
+
+def test_retry_transient_reraises_after_last_attempt(ft):
+    calls = []
+
+    @ft.retry_transient(attempts=3)
+    def always_down():
+        calls.append(1)
+        raise requests.exceptions.ConnectionError("down")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        always_down()
+    assert len(calls) == 3
+
+
+def test_quote_batch_retried_on_curl_cffi_timeout(ft, monkeypatch):
+    calls = []
+
+    class FlakyYfData:
+        def get_raw_json(self, url, params=None, timeout=30):
+            calls.append(params["symbols"])
+            if len(calls) == 1:
+                raise curl_exceptions.Timeout("timed out")
+            return {"quoteResponse": {"result": [{"symbol": "TCS.NS", "regularMarketPrice": 3500.0}]}}
+
+    monkeypatch.setattr("yfinance.data.YfData", FlakyYfData)
+    prices = ft.StockPortfolioService().fetch_current_prices(["TCS.NS"])
+
+    assert prices["TCS.NS"]["price"] == 3500.0
+    assert calls == ["TCS.NS", "TCS.NS"]
@@ -0,0 +1,16 @@
+import pandas as pd
+
+
+def test_parse_statements_keeps_mixed_iso_dates(ft):
+    service = ft.BankAggregatorService("key", "")
+    df = service._parse_statements({"accounts": [{
+        "account_number": "1",
+        "bank_name": "HDFC",
+        "transactions": [
+            {"date": "2024-01-05", "amount": -250.0},
+            {"date": "2024-01-05T10:30:00", "amount": 1000.0},
+        ],
+    }]})
+
+    assert df["date"].tolist() == [pd.Timestamp("2024-01-05"), pd.Timestamp("2024-01-05 10:30:00")]
+    assert df["type"].tolist() == ["debit", "credit"]